@@ -1,191 +1,240 @@
 # -*- coding: utf-8 -*-
+import base64
+import datetime
+import hashlib
+import hmac
 import json
 import os
 import logging
-
-# AWS SDK（Lambda ランタイムに同梱。requirements.txtへ追加不要）
-import boto3
-from botocore.exceptions import ClientError
+import socket
+import urllib.parse
+import urllib.request
 
 # 外部ライブラリ
 import anthropic
+import httpx
+import orjson
 from ask_sdk_core.skill_builder import SkillBuilder
 from ask_sdk_core.dispatch_components import AbstractRequestHandler, AbstractExceptionHandler
 from ask_sdk_core.utils import is_request_type, is_intent_name
-from ask_sdk_core.handler_input import HandlerInput
-from ask_sdk_model import Response
+from ask_sdk_model import RequestEnvelope
 
-# ローカル実行時のみ .env を読む（本番Lambdaでは無視される）
-try:
+from skill_core import call_claude, execute_actions
+
+# ローカル実行時のみ .env を読む（Lambda 上では dotenv の import 自体を行わない）
+# python-dotenv はローカル用の requirements-dev.txt にのみ含め、Lambda には同梱しない
+if "AWS_LAMBDA_FUNCTION_NAME" not in os.environ:
     from dotenv import load_dotenv
     load_dotenv()
-except Exception:
-    pass
 
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+# 本番は WARNING 以上のみ（調査時は環境変数 LOG_LEVEL=INFO / DEBUG）
+# 不正な値で INIT（SnapStart のスナップショット作成を含む）を落とさないよう、未知の値は WARNING 扱い
+_log_level = os.environ.get("LOG_LEVEL", "WARNING").strip().upper()
+if _log_level in logging.getLevelNamesMapping():
+    logger.setLevel(_log_level)
+else:
+    logger.setLevel(logging.WARNING)
+    logger.warning("LOG_LEVEL=%r は不正なため WARNING を使用します", os.environ["LOG_LEVEL"])
 
 # ======================================================================
-# 機密情報の取得：環境変数 → SSM → Secrets Manager の順で解決（結果は env にキャッシュ）
+# 機密情報の取得：環境変数 → SSM → Secrets Manager の順で解決（結果はモジュール変数にキャッシュ）
 #   ANTHROPIC_API_KEY_PARAM : SSM のパラメータ名（例: /nature-talk/prod/anthropic_api_key）
 #   ANTHROPIC_SECRET_ID     : Secrets Manager のシークレット名（例: nature-talk/anthropic）
+# SSM / Secrets Manager へは Parameters and Secrets Lambda Extension（localhost の
+# HTTP キャッシュ）経由でアクセスし、使えない場合は SigV4 署名で API を直接呼ぶ。
+# どちらも標準ライブラリのみで実装し、boto3 はコールドスタート時に読み込まない。
 # ======================================================================
 
+_EXTENSION_PORT = os.environ.get("PARAMETERS_SECRETS_EXTENSION_HTTP_PORT", "2773")
+_EXTENSION_TIMEOUT = 3  # 秒
+_AWS_API_TIMEOUT = 5  # 秒
+
+def _extension_get(path: str, query: dict) -> dict:
+    """Parameters and Secrets Lambda Extension から JSON を取得する"""
+    url = f"http://localhost:{_EXTENSION_PORT}{path}?{urllib.parse.urlencode(query)}"
+    req = urllib.request.Request(
+        url, headers={"X-Aws-Parameters-Secrets-Token": os.environ.get("AWS_SESSION_TOKEN", "")}
+    )
+    with urllib.request.urlopen(req, timeout=_EXTENSION_TIMEOUT) as resp:
+        return json.loads(resp.read())
+
+def _aws_json_request(service: str, target: str, payload: dict) -> dict:
+    """SigV4 署名付きで AWS の JSON プロトコル API（SSM / Secrets Manager）を直接呼ぶ"""
+    region = os.environ["AWS_REGION"]
+    host = f"{service}.{region}.amazonaws.com"
+    body = json.dumps(payload).encode("utf-8")
+    now = datetime.datetime.now(datetime.timezone.utc)
+    amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+    date_stamp = now.strftime("%Y%m%d")
+
+    headers = {
+        "content-type": "application/x-amz-json-1.1",
+        "host": host,
+        "x-amz-date": amz_date,
+        "x-amz-target": target,
+    }
+    if os.environ.get("AWS_SESSION_TOKEN"):
+        headers["x-amz-security-token"] = os.environ["AWS_SESSION_TOKEN"]
+
+    # 正規リクエスト → 署名対象文字列 → 署名（https://docs.aws.amazon.com/IAM/latest/UserGuide/reference_sigv-create-signed-request.html）
+    signed_headers = ";".join(sorted(headers))
+    canonical_headers = "".join(f"{k}:{headers[k]}\n" for k in sorted(headers))
+    canonical_request = "\n".join([
+        "POST", "/", "", canonical_headers, signed_headers, hashlib.sha256(body).hexdigest(),
+    ])
+    scope = f"{date_stamp}/{region}/{service}/aws4_request"
+    string_to_sign = "\n".join([
+        "AWS4-HMAC-SHA256", amz_date, scope,
+        hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+    ])
+    key = ("AWS4" + os.environ["AWS_SECRET_ACCESS_KEY"]).encode("utf-8")
+    for part in (date_stamp, region, service, "aws4_request"):
+        key = hmac.new(key, part.encode("utf-8"), hashlib.sha256).digest()
+    signature = hmac.new(key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+    headers["authorization"] = (
+        f"AWS4-HMAC-SHA256 Credential={os.environ['AWS_ACCESS_KEY_ID']}/{scope}, "
+        f"SignedHeaders={signed_headers}, Signature={signature}"
+    )
+
+    req = urllib.request.Request(f"https://{host}/", data=body, headers=headers, method="POST")
+    with urllib.request.urlopen(req, timeout=_AWS_API_TIMEOUT) as resp:
+        return json.loads(resp.read())
+
+def _get_ssm_parameter(name: str) -> str:
+    try:
+        resp = _extension_get("/systemsmanager/parameters/get", {"name": name, "withDecryption": "true"})
+    except (OSError, ValueError) as e:
+        logger.warning("[SSM] extension unavailable, calling API directly: %s", e)
+        resp = _aws_json_request("ssm", "AmazonSSM.GetParameter", {"Name": name, "WithDecryption": True})
+    return resp["Parameter"]["Value"]
+
+def _get_secret(secret_id: str) -> str:
+    try:
+        sec = _extension_get("/secretsmanager/get", {"secretId": secret_id})
+    except (OSError, ValueError) as e:
+        logger.warning("[SecretsManager] extension unavailable, calling API directly: %s", e)
+        sec = _aws_json_request("secretsmanager", "secretsmanager.GetSecretValue", {"SecretId": secret_id})
+    return sec.get("SecretString") or base64.b64decode(sec["SecretBinary"]).decode("utf-8")
+
+_api_key = None
 def _get_api_key() -> str:
+    global _api_key
+    if _api_key:
+        return _api_key
+
     # 1) 既に環境変数にあればそれを使う
     if os.environ.get("ANTHROPIC_API_KEY"):
-        return os.environ["ANTHROPIC_API_KEY"]
+        _api_key = os.environ["ANTHROPIC_API_KEY"]
+        return _api_key
 
     # 2) SSM Parameter Store（SecureString 前提）
     param_name = os.environ.get("ANTHROPIC_API_KEY_PARAM")
     if param_name:
         try:
-            ssm = boto3.client("ssm")
-            resp = ssm.get_parameter(Name=param_name, WithDecryption=True)
-            val = resp["Parameter"]["Value"]
-            os.environ["ANTHROPIC_API_KEY"] = val  # キャッシュ
-            logger.info(f"[SSM] fetched parameter: {param_name}")
-            return val
-        except ClientError as e:
-            logger.error(f"[SSM] get_parameter failed: {e}")
+            _api_key = _get_ssm_parameter(param_name)
+            logger.info("[SSM] fetched parameter: %s", param_name)
+            return _api_key
+        except (OSError, ValueError, KeyError) as e:
+            logger.error("[SSM] get_parameter failed: %s", e)
 
     # 3) Secrets Manager
     secret_id = os.environ.get("ANTHROPIC_SECRET_ID")
     if secret_id:
         try:
-            sm = boto3.client("secretsmanager")
-            sec = sm.get_secret_value(SecretId=secret_id)
-            val = sec.get("SecretString") or sec["SecretBinary"].decode("utf-8")
-            os.environ["ANTHROPIC_API_KEY"] = val  # キャッシュ
-            logger.info(f"[SecretsManager] fetched secret: {secret_id}")
-            return val
-        except ClientError as e:
-            logger.error(f"[SecretsManager] get_secret_value failed: {e}")
+            _api_key = _get_secret(secret_id)
+            logger.info("[SecretsManager] fetched secret: %s", secret_id)
+            return _api_key
+        except (OSError, ValueError, KeyError) as e:
+            logger.error("[SecretsManager] get_secret_value failed: %s", e)
 
     raise ValueError("ANTHROPIC_API_KEY が設定されていません")
 
+# api.anthropic.com への接続をウォームスタート間で再利用する（DNS / TCP / TLS の往復を省く）
+#   ※ transport を渡すと httpx.Client の limits は使われないため、transport 側に指定する
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=4, keepalive_expiry=900.0)
+_HTTP_TIMEOUT = httpx.Timeout(20.0, connect=3.0)
+
+_http_client = None
+def _get_http_client() -> httpx.Client:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(
+            timeout=_HTTP_TIMEOUT,
+            transport=httpx.HTTPTransport(limits=_HTTP_LIMITS, retries=1),
+        )
+    return _http_client
+
 _client = None
 def _get_claude_client() -> anthropic.Anthropic:
     global _client
     if _client is None:
         api_key = _get_api_key()
-        _client = anthropic.Anthropic(api_key=api_key)
+        _client = anthropic.Anthropic(api_key=api_key, http_client=_get_http_client())
     return _client
 
-# スマートホームデバイスのシミュレーション
-devices = {
-    "light": {"status": "off", "brightness": 0},
-    "aircon": {"status": "off", "temperature": 25}
-}
-
-def call_claude(user_message, conversation_history=None):
-    """Claudeに問い合わせる"""
-    if conversation_history is None:
-        conversation_history = []
-
-    logger.info("=== Claude API 呼び出し開始 ===")
-    logger.info(f"ユーザーメッセージ: {user_message}")
-
-    system_prompt = """あなたはネイチャートークアシスタント、親しみやすいAIアシスタントです。
-
-スマートホームデバイスの制御も可能ですが、それ以外の会話も自然に対応してください。
-
-利用可能なデバイス:
-- light（照明）: on/off, brightness 0-100
-- aircon（エアコン）: on/off, temperature 16-30
-
-ユーザーの発言を理解し、以下のJSON形式で応答してください：
-{
-  "response": "ユーザーへの自然な返答",
-  "actions": [
-    {"device": "light", "command": "on", "value": 80}
-  ]
-}
-
-デバイス制御が不要な場合（雑談、質問など）、actionsは空配列にしてください。
-日本語で自然に、親しみやすく会話してください。
+def _warm_up_dns(host: str) -> None:
+    """api.anthropic.com の名前解決だけ先に済ませる"""
+    try:
+        socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+    except OSError as e:
+        logger.warning("[Init] DNS ウォームアップ失敗: %s", e)
 
-重要: 応答は純粋なJSONのみで、```json```のようなマークダウンは使わないでください。"""
+def _warm_up_connection(http_client: httpx.Client, url: str) -> None:
+    """api.anthropic.com への接続（DNS / TCP / TLS）を先に張り、コネクションプールに残す"""
+    try:
+        http_client.head(url, timeout=3)
+    except Exception as e:
+        logger.warning("[Init] 接続ウォームアップ失敗: %s", e)
 
-    messages = conversation_history + [
-        {"role": "user", "content": user_message}
-    ]
+# INIT フェーズで API キー取得とクライアント生成を済ませる。
+# 失敗した場合（拡張機能が未起動など）は初回リクエスト時に _get_claude_client() で再試行する。
+try:
+    _init_client = _get_claude_client()
+except Exception as e:
+    logger.warning("[Init] Claude クライアントの初期化を初回リクエストまで延期: %s", e)
+else:
+    # プロビジョニング済み同時実行などでは INIT からリクエストまで時間が空き、
+    # 張った接続が切れている可能性が高いため、オンデマンド時以外は名前解決のみ
+    if os.environ.get("AWS_LAMBDA_INITIALIZATION_TYPE") == "on-demand":
+        _warm_up_connection(_get_http_client(), str(_init_client.base_url))
+    else:
+        _warm_up_dns(_init_client.base_url.host)
+
+# SnapStart：INIT 時に張った接続はスナップショットへ持ち越さず、復元後に張り直す
+try:
+    from snapshot_restore_py import register_after_restore  # type: ignore[import-not-found]
+except ImportError:  # ローカル実行時など（Lambda の Python 3.12 以降のランタイムに同梱）
+    register_after_restore = None
 
+def _after_restore() -> None:
     try:
         client = _get_claude_client()
-        response = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1024,
-            system=system_prompt,
-            messages=messages
-        )
-
-        usage = getattr(response, "usage", None)
-        if usage:
-            logger.info(f"トークン使用量 - 入力: {usage.input_tokens}, 出力: {usage.output_tokens}")
-
-        claude_response = response.content[0].text.strip()
-        logger.info(f"Claude生応答: {claude_response}")
-
-        # 余計なコードブロック表記の除去
-        if claude_response.startswith("```json"):
-            claude_response = claude_response[7:]
-        if claude_response.startswith("```"):
-            claude_response = claude_response[3:]
-        if claude_response.endswith("```"):
-            claude_response = claude_response[:-3]
-        claude_response = claude_response.strip()
-
-        parsed = json.loads(claude_response)
-        logger.info(f"パース済み応答: {parsed}")
-        return parsed
-
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON パースエラー: {e}")
-        logger.error(f"パース失敗した文字列: {claude_response}")
-        return {"response": "すみません、うまく理解できませんでした。もう一度お願いします。", "actions": []}
     except Exception as e:
-        logger.error(f"Claude API エラー: {e}", exc_info=True)
-        return {"response": "申し訳ございません。エラーが発生しました。", "actions": []}
-
-def execute_actions(actions):
-    """デバイス制御を実行（現在はシミュレーション）"""
-    results = []
-    for action in actions:
-        device = action.get("device")
-        command = action.get("command")
-        value = action.get("value")
-
-        if device in devices:
-            if command == "on":
-                devices[device]["status"] = "on"
-            elif command == "off":
-                devices[device]["status"] = "off"
-
-            if value is not None:
-                if device == "light":
-                    devices[device]["brightness"] = value
-                elif device == "aircon":
-                    devices[device]["temperature"] = value
-
-            results.append(f"{device}を制御しました")
-    return results
+        logger.warning("[Restore] Claude クライアントの初期化を初回リクエストまで延期: %s", e)
+        return
+    _warm_up_connection(_get_http_client(), str(client.base_url))
+
+if register_after_restore is not None:
+    register_after_restore(_after_restore)
 
 # =========================
 # Alexa スキルハンドラー
 # =========================
 
 class LaunchRequestHandler(AbstractRequestHandler):
+    _MATCH = staticmethod(is_request_type("LaunchRequest"))
     def can_handle(self, handler_input):
-        return is_request_type("LaunchRequest")(handler_input)
+        return self._MATCH(handler_input)
     def handle(self, handler_input):
         logger.info("=== LaunchRequest ===")
         speech_text = "ネイチャートークアシスタントです。何かお手伝いしましょうか？"
         return handler_input.response_builder.speak(speech_text).ask(speech_text).response
 
 class FreeTalkIntentHandler(AbstractRequestHandler):
+    _MATCH = staticmethod(is_intent_name("FreeTalkIntent"))
     def can_handle(self, handler_input):
-        return is_intent_name("FreeTalkIntent")(handler_input)
+        return self._MATCH(handler_input)
     def handle(self, handler_input):
         logger.info("=== FreeTalkIntent ===")
         request = handler_input.request_envelope.request
@@ -195,50 +244,39 @@ class FreeTalkIntentHandler(AbstractRequestHandler):
             if 'UserInput' in slots and slots['UserInput'].value:
                 user_input = slots['UserInput'].value
         except Exception as e:
-            logger.warning(f"スロット取得エラー: {e}")
+            logger.warning("スロット取得エラー: %s", e)
 
-        result = call_claude(user_input or "ユーザーが何か話しかけました")
+        result = call_claude(_get_claude_client, user_input or "ユーザーが何か話しかけました")
         speech_text = result["response"]
         if result.get("actions"):
             execute_actions(result["actions"])
         return handler_input.response_builder.speak(speech_text).ask("他に何かありますか？").response
 
-class SimplePhraseHandler(AbstractRequestHandler):
-    def can_handle(self, handler_input):
-        return is_intent_name("SimplePhrase")(handler_input)
-    def handle(self, handler_input):
-        logger.info("=== SimplePhrase ===")
-        result = call_claude("ユーザーが状態や感情を表現しました（暑い、寒い、疲れた等）。適切に応答してください。")
-        speech_text = result["response"]
-        if result.get("actions"):
-            execute_actions(result["actions"])
-        return handler_input.response_builder.speak(speech_text).ask("他に何かありますか？").response
-
-class DeviceControlHandler(AbstractRequestHandler):
-    def can_handle(self, handler_input):
-        return is_intent_name("DeviceControl")(handler_input)
-    def handle(self, handler_input):
-        logger.info("=== DeviceControl ===")
-        result = call_claude("ユーザーがデバイスの操作を要求しました（つけて、消して等）。文脈から判断して適切に対応してください。")
-        speech_text = result["response"]
-        if result.get("actions"):
-            execute_actions(result["actions"])
-        return handler_input.response_builder.speak(speech_text).ask("他に何かありますか？").response
+# 固定の指示文を Claude に渡すだけのインテント（インテント名 → 指示文）
+_INTENT_PROMPTS = {
+    "SimplePhrase": "ユーザーが状態や感情を表現しました（暑い、寒い、疲れた等）。適切に応答してください。",
+    "DeviceControl": "ユーザーがデバイスの操作を要求しました（つけて、消して等）。文脈から判断して適切に対応してください。",
+    "AMAZON.FallbackIntent": "ユーザーが話しかけましたが、正確には聞き取れませんでした。自然に会話を続けてください。",
+}
 
-class FallbackIntentHandler(AbstractRequestHandler):
+class PromptedIntentHandler(AbstractRequestHandler):
+    _MATCH = staticmethod(is_request_type("IntentRequest"))
     def can_handle(self, handler_input):
-        return is_intent_name("AMAZON.FallbackIntent")(handler_input)
+        return (self._MATCH(handler_input) and
+                handler_input.request_envelope.request.intent.name in _INTENT_PROMPTS)
     def handle(self, handler_input):
-        logger.info("=== FallbackIntent ===")
-        result = call_claude("ユーザーが話しかけましたが、正確には聞き取れませんでした。自然に会話を続けてください。")
+        intent_name = handler_input.request_envelope.request.intent.name
+        logger.info("=== %s ===", intent_name)
+        result = call_claude(_get_claude_client, _INTENT_PROMPTS[intent_name])
         speech_text = result["response"]
         if result.get("actions"):
             execute_actions(result["actions"])
         return handler_input.response_builder.speak(speech_text).ask("他に何かありますか？").response
 
 class HelpIntentHandler(AbstractRequestHandler):
+    _MATCH = staticmethod(is_intent_name("AMAZON.HelpIntent"))
     def can_handle(self, handler_input):
-        return is_intent_name("AMAZON.HelpIntent")(handler_input)
+        return self._MATCH(handler_input)
     def handle(self, handler_input):
         logger.info("=== HelpIntent ===")
         speech_text = ("ネイチャートークアシスタントです。"
@@ -247,21 +285,23 @@ class HelpIntentHandler(AbstractRequestHandler):
         return handler_input.response_builder.speak(speech_text).ask("何かお手伝いしましょうか？").response
 
 class CancelOrStopIntentHandler(AbstractRequestHandler):
+    _MATCH_CANCEL = staticmethod(is_intent_name("AMAZON.CancelIntent"))
+    _MATCH_STOP = staticmethod(is_intent_name("AMAZON.StopIntent"))
     def can_handle(self, handler_input):
-        return (is_intent_name("AMAZON.CancelIntent")(handler_input) or
-                is_intent_name("AMAZON.StopIntent")(handler_input))
+        return self._MATCH_CANCEL(handler_input) or self._MATCH_STOP(handler_input)
     def handle(self, handler_input):
         logger.info("=== Cancel/Stop ===")
         return handler_input.response_builder.speak("またお話ししましょう").response
 
 class SessionEndedRequestHandler(AbstractRequestHandler):
+    _MATCH = staticmethod(is_request_type("SessionEndedRequest"))
     def can_handle(self, handler_input):
-        return is_request_type("SessionEndedRequest")(handler_input)
+        return self._MATCH(handler_input)
     def handle(self, handler_input):
         logger.info("=== SessionEnded ===")
         req = handler_input.request_envelope.request
         try:
-            logger.info(f"reason={getattr(req,'reason',None)} error={getattr(req,'error',None)}")
+            logger.info("reason=%s error=%s", getattr(req, "reason", None), getattr(req, "error", None))
         except Exception:
             pass
         return handler_input.response_builder.response
@@ -274,14 +314,14 @@ class CatchAllRequestHandler(AbstractRequestHandler):
         env = handler_input.request_envelope
         rtype = getattr(env.request, 'object_type', None)
         iname = getattr(getattr(env.request, 'intent', None), 'name', None)
-        logger.warning(f"[CatchAll] Unmatched request: type={rtype} intent={iname}")
+        logger.warning("[CatchAll] Unmatched request: type=%s intent=%s", rtype, iname)
         return handler_input.response_builder.speak("すみません、そのリクエストにはまだ対応していません。").response
 
 class AllExceptionHandler(AbstractExceptionHandler):
     def can_handle(self, handler_input, exception):
         return True
     def handle(self, handler_input, exception):
-        logger.error(f"[Exception] {exception}", exc_info=True)
+        logger.error("[Exception] %s", exception, exc_info=True)
         return handler_input.response_builder.speak("エラーが発生しました。もう一度お願いします。").response
 
 # =========================
@@ -291,9 +331,7 @@ class AllExceptionHandler(AbstractExceptionHandler):
 sb = SkillBuilder()
 sb.add_request_handler(LaunchRequestHandler())
 sb.add_request_handler(FreeTalkIntentHandler())
-sb.add_request_handler(SimplePhraseHandler())
-sb.add_request_handler(DeviceControlHandler())
-sb.add_request_handler(FallbackIntentHandler())
+sb.add_request_handler(PromptedIntentHandler())
 sb.add_request_handler(HelpIntentHandler())
 sb.add_request_handler(CancelOrStopIntentHandler())
 sb.add_request_handler(SessionEndedRequestHandler())
@@ -302,9 +340,25 @@ sb.add_request_handler(SessionEndedRequestHandler())
 sb.add_request_handler(CatchAllRequestHandler())
 sb.add_exception_handler(AllExceptionHandler())
 
+# スキル本体は INIT 時に一度だけ構築して使い回す
+# （sb.lambda_handler() のラッパーは呼び出しごとに CustomSkill を作り直すため使わない）
+_skill = sb.create()
+
 def lambda_handler(event, context):
-    logger.info("=" * 80)
-    logger.info("★ Lambda 起動")
-    logger.info(json.dumps(event)[:2000])  # 先頭だけログ
-    logger.info("=" * 80)
-    return sb.lambda_handler()(event, context)
+    # EventBridge のウォーマー（template.yml の Warmer）：コンテナを温めるだけで、スキルは呼ばない
+    if event.get("warmer"):
+        return {"warmed": True}
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("=" * 80)
+        logger.info("★ Lambda 起動")
+        request = event.get("request") or {}
+        logger.info("type=%s intent=%s", request.get("type"), (request.get("intent") or {}).get("name"))
+        if logger.isEnabledFor(logging.DEBUG):
+            # イベント全体は DEBUG 時のみ先頭だけログ（orjson は UTF-8 のまま出力するので、切れたマルチバイト文字は捨てる）
+            logger.debug(orjson.dumps(event)[:2000].decode("utf-8", "ignore"))
+        logger.info("=" * 80)
+    request_envelope = _skill.serializer.deserialize(
+        payload=orjson.dumps(event).decode("utf-8"), obj_type=RequestEnvelope)
+    response_envelope = _skill.invoke(request_envelope=request_envelope, context=context)
+    return _skill.serializer.serialize(response_envelope)
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+# Claude 呼び出しとデバイス制御のコア処理（リクエストごとに必ず通る部分）
+# 型注釈付きで書いてあり、ビルド時に mypyc で C 拡張へコンパイルできる（src/Makefile 参照）
+import json
+import logging
+import math
+import re
+from collections.abc import Callable
+
+import anthropic
+import orjson
+from anthropic.lib.streaming import MessageStream
+from anthropic.types import MessageParam, TextBlockParam
+
+logger = logging.getLogger(__name__)
+
+# スマートホームデバイスのシミュレーション（状態と設定値をデバイス名ごとのフラットな dict で保持）
+device_status: dict[str, str] = {"light": "off", "aircon": "off"}
+device_value: dict[str, int] = {"light": 0, "aircon": 25}
+# device_value の意味（light は明るさ、aircon は設定温度）
+VALUE_FIELD: dict[str, str] = {"light": "brightness", "aircon": "temperature"}
+
+# 全リクエスト共通のシステムプロンプト（モジュール読み込み時に一度だけ生成）
+_SYSTEM_PROMPT = """あなたはネイチャートークアシスタント、親しみやすいAIアシスタントです。
+
+スマートホームデバイスの制御も可能ですが、それ以外の会話も自然に対応してください。
+
+利用可能なデバイス:
+- light（照明）: on/off, brightness 0-100
+- aircon（エアコン）: on/off, temperature 16-30
+
+ユーザーの発言を理解し、以下のJSON形式で応答してください：
+{
+  "response": "ユーザーへの自然な返答",
+  "actions": [
+    {"device": "light", "command": "on", "value": 80}
+  ]
+}
+
+デバイス制御が不要な場合（雑談、質問など）、actionsは空配列にしてください。
+日本語で自然に、親しみやすく会話してください。
+response は音声で読み上げるため、50文字程度までの短い返答にしてください。
+
+重要: 応答は純粋なJSONのみで、```json```のようなマークダウンは使わないでください。JSONの途中に空行は入れないでください。"""
+
+# cache_control 付きで渡し、Anthropic 側のプロンプトキャッシュを有効にする。
+# （キャッシュ対象になるのはプロンプトが最小長（Sonnet は 1024 トークン）以上の場合のみ）
+_SYSTEM: list[TextBlockParam] = [{"type": "text", "text": _SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+
+# 応答の先頭 ```json / ``` と末尾 ``` を一度に取り除く
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.DOTALL)
+
+def _read_reply(stream: MessageStream) -> str:
+    """ストリーミング応答のテキストを集める。
+
+    最上位の JSON オブジェクトが閉じた後に空白・コードブロック記号以外の出力が続いた場合は、
+    その時点で読み取りを打ち切る（不要な後続トークンの生成を待たない）。
+    正常終了時は最後まで読み切るので、接続はコネクションプールに戻る。
+    """
+    parts: list[str] = []
+    depth = 0
+    in_string = escaped = closed = False
+    for chunk in stream.text_stream:
+        if closed:
+            if chunk.strip(" \t\r\n`"):
+                logger.info("JSON 後の余分な出力を検出したため読み取りを打ち切ります")
+                break
+            parts.append(chunk)
+            continue
+        parts.append(chunk)
+        for i, ch in enumerate(chunk):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    closed = True
+                    if chunk[i + 1:].strip(" \t\r\n`"):
+                        parts[-1] = chunk[:i + 1]
+                        logger.info("JSON 後の余分な出力を検出したため読み取りを打ち切ります")
+                        return "".join(parts)
+                    break
+    return "".join(parts)
+
+def call_claude(
+    get_client: Callable[[], anthropic.Anthropic],
+    user_message: str,
+    conversation_history: list[MessageParam] | None = None,
+) -> dict:
+    """Claudeに問い合わせる（クライアント取得の失敗も含めて、エラー時は固定の返答を返す）"""
+    if conversation_history is None:
+        conversation_history = []
+
+    logger.info("=== Claude API 呼び出し開始 ===")
+    logger.info("ユーザーメッセージ: %s", user_message)
+
+    messages: list[MessageParam] = conversation_history + [
+        {"role": "user", "content": user_message}
+    ]
+
+    try:
+        client = get_client()
+        with client.messages.stream(
+            model="claude-sonnet-4-20250514",
+            max_tokens=256,  # 音声応答は短いので上限を抑える（stop_reason で途切れを監視）
+            stop_sequences=["\n\n"],  # JSON の後に続く余談はサーバー側で打ち切る
+            system=_SYSTEM,
+            messages=messages
+        ) as stream:
+            claude_response = _read_reply(stream)
+            response = stream.current_message_snapshot
+
+        if getattr(response, "stop_reason", None) == "max_tokens":
+            logger.warning("max_tokens に達したため応答が途中で切れています")
+
+        usage = getattr(response, "usage", None)
+        if usage:
+            logger.info("トークン使用量 - 入力: %s, 出力: %s", usage.input_tokens, usage.output_tokens)
+
+        logger.info("Claude生応答: %s", claude_response)
+
+        # 余計なコードブロック表記の除去（前後の空白は orjson がそのまま許容する）
+        if "`" in claude_response:
+            claude_response = _FENCE_RE.sub("", claude_response)
+
+        parsed = orjson.loads(claude_response)
+        logger.info("パース済み応答: %s", parsed)
+        return parsed
+
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError はこのサブクラス
+        logger.error("JSON パースエラー: %s", e)
+        logger.error("パース失敗した文字列: %s", claude_response)
+        return {"response": "すみません、うまく理解できませんでした。もう一度お願いします。", "actions": []}
+    except Exception as e:
+        logger.error("Claude API エラー: %s", e, exc_info=True)
+        return {"response": "申し訳ございません。エラーが発生しました。", "actions": []}
+
+def _to_int_value(value: object) -> int | None:
+    """Claude が返した value を device_value に入れられる int にする（変換できなければ None）"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and math.isfinite(value):
+        return math.floor(value + 0.5)  # 22.5度 などの小数は常に四捨五入（round() の偶数丸めは使わない）
+    if isinstance(value, str) and value.strip().isdecimal():
+        return int(value)  # "80" のような数字文字列
+    return None
+
+def execute_actions(actions: list[dict]) -> list[str]:
+    """デバイス制御を実行（現在はシミュレーション）"""
+    results: list[str] = []
+    for action in actions:
+        device = action.get("device")
+        if device not in device_status:
+            continue
+        command = action.get("command")
+        raw_value = action.get("value")
+
+        # 状態を書き換える前に検証する（mypyc ビルドでは int 以外を入れると読み出し時に TypeError）
+        value = None
+        if raw_value is not None:
+            value = _to_int_value(raw_value)
+            if value is None:
+                logger.warning("%s: 不正な value を無視します: %r", device, raw_value)
+
+        if command == "on" or command == "off":
+            device_status[device] = command
+        if value is not None:
+            device_value[device] = value
+
+        logger.info("%s: status=%s %s=%s", device, device_status[device], VALUE_FIELD[device], device_value[device])
+        results.append(f"{device}を制御しました")
+    return results